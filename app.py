@@ -1,9 +1,9 @@
+import os
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
+import pyarrow.parquet as pq
 
 # ----------------------------
 # Page Setup
@@ -13,29 +13,88 @@ st.set_page_config(page_title="EMS Crash Injury Disparities", page_icon="🚑",
 # ----------------------------
 # Data Loading and Preprocessing (Directly from GitHub Repo)
 # ----------------------------
-@st.cache_data(show_spinner="Processing data...")
+DATA_CSV = 'sampled_ems_data_100k.csv'
+DATA_PARQUET = 'sampled_ems_data_100k.parquet'  # typed snapshot the app writes after its first CSV parse
+
+# Parse straight into the final dtypes instead of inferring object columns and re-casting.
+# Survey years fit in 16 bits; nullable so blank or malformed years stay <NA>.
+YEAR_DTYPE = 'Int16'
+
+# Year is left out on purpose: postprocess coerces it so a stray non-numeric entry becomes <NA>.
+DTYPES = {
+    'Gender': 'category',
+    'Race': 'category',
+    'USCensusDivision': 'category',
+    'Urbanicity': 'category',
+    'Age Units': 'category',
+}
+
+# Single source of truth for the AgeGroup display order.
+AGE_ORDER = ['0-24','25-34','35-44','45-54','55-64','65-74','75-84','85+']
+
+# Upper bound on rows any example table ships to the browser.
+MAX_PREVIEW_ROWS = 100
+
 def postprocess(df: pd.DataFrame) -> pd.DataFrame:
     """Performs post-processing like type conversion after data loading."""
     if 'Year' in df.columns:
-        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype('Int64')
+        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype(YEAR_DTYPE)
     if 'AgeGroup' in df.columns:
-        order = ['0-24','25-34','35-44','45-54','55-64','65-74','75-84','85+']
-        df['AgeGroup'] = pd.Categorical(df['AgeGroup'], categories=order, ordered=True)
+        df['AgeGroup'] = pd.Categorical(df['AgeGroup'], categories=AGE_ORDER, ordered=True)
+    # Low-cardinality labels: one small integer code per row instead of a Python string.
+    for col in ('Gender', 'Race', 'USCensusDivision', 'Urbanicity', 'Age Units'):
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def load_parquet(file_path: str) -> pd.DataFrame:
+    """Loads the Parquet snapshot (columnar, typed, no text parsing)."""
+    df = pq.ParquetFile(file_path).read().to_pandas()
+    df = postprocess(df)
     return df
 
-@st.cache_data(show_spinner="Loading sample data...")
 def load_data_from_repo(file_path: str) -> pd.DataFrame:
     """Loads and preprocesses the CSV file from the GitHub repository."""
-    df = pd.read_csv(file_path, low_memory=False)
+    df = pd.read_csv(file_path, dtype=DTYPES, engine='pyarrow')
     df = postprocess(df)
     return df
 
+def write_parquet_snapshot(df: pd.DataFrame, file_path: str) -> None:
+    """Best-effort snapshot: written to a temp file and renamed, so readers never see a partial file."""
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        # Read-only checkout or a frame Arrow cannot write; keep serving the frame we already have.
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+@st.cache_resource(show_spinner="Loading sample data...", max_entries=1)
+def load_data(csv_path: str, parquet_path: str) -> pd.DataFrame:
+    """Returns the one shared frame: the Parquet snapshot if it is current, otherwise the parsed CSV."""
+    csv_mtime = os.path.getmtime(csv_path) if os.path.exists(csv_path) else 0.0
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= csv_mtime:
+        try:
+            return load_parquet(parquet_path)
+        except Exception:
+            pass  # truncated or unreadable snapshot; rebuild it from the CSV below
+    df = load_data_from_repo(csv_path)
+    # Compile once: later cold starts read the typed Parquet copy instead of re-parsing the CSV.
+    write_parquet_snapshot(df, parquet_path)
+    return df
+
 # --- Main data loading execution ---
 try:
-    # Specify the name of the sample data file uploaded to the GitHub repository.
-    df = load_data_from_repo('sampled_ems_data_100k.csv')
+    # Prefer a current Parquet snapshot; fall back to the sample CSV uploaded to the GitHub repository.
+    # The resource cache shares the frame across sessions; session_state pins it for this session's reruns.
+    if 'df' not in st.session_state:
+        st.session_state['df'] = load_data(DATA_CSV, DATA_PARQUET)
+    df = st.session_state['df']
 except FileNotFoundError:
-    st.error("Error: 'sampled_ems_data_100k.csv' file not found.")
+    st.error(f"Error: '{DATA_CSV}' file not found.")
     st.info("Please ensure the data file is in the same GitHub repository as app.py.")
     st.stop()
 except Exception as e:
@@ -43,7 +102,11 @@ except Exception as e:
     st.stop()
 
 # use full dataset everywhere
+# NOTE: the loaders use st.cache_resource, so `df`/`fdf` is one shared object returned by
+# reference (no pickle/hash round-trip). Treat it as read-only: never mutate it in place,
+# always work on a `.copy()` or on derived frames.
 fdf = df
+COLS = frozenset(fdf.columns)  # column-presence checks without scanning the Index each time
 
 # ----------------------------
 # Sidebar: Page Navigation
@@ -64,16 +127,115 @@ page = st.sidebar.radio("Go to", list(pages.keys()))
 # ----------------------------
 # Helper
 # ----------------------------
-def safe_is_numeric(col):
-    try:
-        return pd.api.types.is_numeric_dtype(col)
-    except:
-        return False
+# Dimensions charted on the Visualization page; counted together in one pass.
+CUBE_DIMS = tuple(c for c in ('Gender', 'Race', 'Year', 'USCensusDivision') if c in COLS)
+
+@st.cache_data(show_spinner=False)
+def master_counts(_df: pd.DataFrame):
+    """Counts every CUBE_DIMS combination with one np.bincount over the integer codes.
+
+    Returns the dense count array and the labels of each axis. Slot 0 on every axis holds NaN,
+    so each marginal can drop only its own missing values.
+    """
+    codes, labels = [], []
+    for col in CUBE_DIMS:
+        s = _df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            c, u = s.cat.codes.to_numpy(), s.cat.categories
+        else:
+            c, u = pd.factorize(s, sort=True)
+        codes.append(c + 1)
+        labels.append(list(u))
+    shape = tuple(len(u) + 1 for u in labels)
+    flat = np.ravel_multi_index(codes, shape)
+    return np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape), labels
+
+@st.cache_data(show_spinner=False)
+def agg_counts(_df: pd.DataFrame, by: tuple) -> pd.DataFrame:
+    """Returns the small count table for `by`; `_df` is not hashed, so the cache is keyed on `by` only."""
+    if set(by) <= set(CUBE_DIMS):
+        cube, labels = master_counts(_df)
+        axes = [CUBE_DIMS.index(c) for c in by]
+        marginal = cube.sum(axis=tuple(i for i in range(cube.ndim) if i not in axes))
+        marginal = marginal.transpose([sorted(axes).index(a) for a in axes])[(slice(1, None),) * len(by)]
+        index = pd.MultiIndex.from_product([labels[a] for a in axes], names=list(by))
+        counts = pd.Series(marginal.ravel(), index=index)
+    else:
+        counts = _df.value_counts(list(by), dropna=True, sort=False)
+    # Unobserved category combinations come back as zero rows; drop them.
+    return counts[counts > 0].reset_index(name='Count')
+
+@st.cache_data(show_spinner=False)
+def duplicate_rows(_df: pd.DataFrame) -> pd.DataFrame:
+    """All rows whose non-missing `PcrKey` occurs more than once, found with a single hash pass."""
+    keys = _df['PcrKey']
+    return _df.loc[keys.duplicated(keep=False) & keys.notna()]
+
+@st.cache_data(show_spinner=False)
+def key_nunique(_dup_df: pd.DataFrame, cols: tuple) -> pd.DataFrame:
+    """Distinct-value counts of `cols` per duplicated `PcrKey`, from a single groupby in first-seen key order."""
+    return _dup_df.groupby('PcrKey', sort=False, observed=True)[list(cols)].nunique()
+
+@st.cache_data(show_spinner=False)
+def hist_counts(values: np.ndarray, bins: int = 50):
+    """Bins `values` on the server so Plotly receives `bins` bars instead of every raw value."""
+    counts, edges = np.histogram(values, bins=bins)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    return centers, counts
+
+@st.cache_data(show_spinner=False)
+def missing_stripes(_df: pd.DataFrame, stage: str, max_rows: int = 1000):
+    """Share of missing cells per column over at most `max_rows` row buckets; `stage` keys the unhashed frame."""
+    miss = _df.isnull().to_numpy()
+    k = max(1, -(-len(miss) // max_rows))
+    n = len(miss) // k * k
+    stripes = miss[:n].reshape(-1, k, miss.shape[1]).mean(axis=1)
+    if n < len(miss):
+        stripes = np.vstack([stripes, miss[n:].mean(axis=0)])
+    return pd.DataFrame(stripes, index=np.arange(len(stripes)) * k, columns=_df.columns)
+
+# Figure builders: keyed on the tiny count frames, so revisiting a page reuses the built figure.
+@st.cache_data(show_spinner=False)
+def fig_missing_heatmap(stripes: pd.DataFrame, title: str):
+    fig = px.imshow(stripes, aspect='auto', color_continuous_scale='viridis', zmin=0, zmax=1,
+                    labels={'x': 'Column', 'y': 'Row', 'color': 'Share missing'}, title=title)
+    fig.update_xaxes(tickangle=-45)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_gender_donut(gender_counts: pd.DataFrame):
+    fig = px.pie(gender_counts, names='Gender', values='Count', hole=0.4,
+                 title="Crash Counts by Gender")
+    fig.update_traces(textinfo='percent+label', pull=[0.04]*len(gender_counts))
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_race_bar(race_counts: pd.DataFrame):
+    fig = px.bar(race_counts, x='Race', y='Count', color='Race',
+                 title="Crash Counts by Race")
+    fig.update_layout(xaxis_tickangle=35)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_year_line(year_counts: pd.DataFrame):
+    fig = px.line(year_counts, x='Year', y='Count', markers=True, render_mode='webgl',
+                  title='Crash Counts by Year')
+    fig.update_layout(xaxis=dict(dtick=1), uirevision='keep')
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_division_bar(div_counts: pd.DataFrame):
+    fig = px.bar(div_counts, x='USCensusDivision', y='Count', color='USCensusDivision',
+                 title='Crash Counts by U.S. Census Division')
+    fig.update_layout(xaxis_tickangle=35, showlegend=False)
+    return fig
 
 # ----------------------------
 # Page Content
 # ----------------------------
-if page == "🏠 Overview":
+@st.fragment
+def render_overview(fdf: pd.DataFrame):
+    """Project goals, audiences, and dataset preview."""
     st.title("🚑 EMS-Reported Crash Injury Disparities: A Policy Analysis Tool")
     
     st.markdown("""
@@ -100,7 +262,9 @@ if page == "🏠 Overview":
     st.subheader("Data Preview")
     st.dataframe(fdf.head())
 
-elif page == "🧹 Handling Data Duplicates":
+@st.fragment
+def render_data_duplicates(fdf: pd.DataFrame):
+    """`PcrKey` uniqueness audit and semantic duplicate diagnosis."""
     st.title("🧹 Handling Data Duplicates")
     st.markdown("""
     Data quality is paramount. My first step was to check for duplicate records. While no **perfectly identical rows** were found, I investigated potential **semantic duplicates** based on the primary incident identifier.
@@ -109,8 +273,10 @@ elif page == "🧹 Handling Data Duplicates":
     st.subheader("Step 1: Identifying Duplicates by Incident ID (`PcrKey`)")
     st.markdown("`PcrKey` should be a unique key for each EMS incident. I checked if any `PcrKey` appeared more than once.")
     
+    dup_df = duplicate_rows(fdf)
     total_count = len(fdf)
-    unique_count = fdf['PcrKey'].nunique()
+    # Same as fdf['PcrKey'].nunique(): missing keys are not incidents, so they are left out.
+    unique_count = total_count - fdf['PcrKey'].isna().sum() - len(dup_df) + dup_df['PcrKey'].nunique()
     duplicated_incidents = total_count - unique_count
 
     col1, col2, col3 = st.columns(3)
@@ -121,25 +287,28 @@ elif page == "🧹 Handling Data Duplicates":
     st.subheader("Step 2: Investigating the Cause of Duplicates")
     st.markdown("The duplicated rows were not perfectly identical, so I formed several hypotheses to explain the cause.")
     
-    dup_keys_series = fdf['PcrKey'].value_counts()
-    dup_keys_list = dup_keys_series[dup_keys_series > 1].index
-    dup_df = fdf[fdf['PcrKey'].isin(dup_keys_list)]
+
+    # One grouped pass over the duplicates answers all three hypotheses and the Race finding below.
+    has_age = 'ageinyear' in COLS  # Check for actual age column
+    time_cols = [c for c in fdf.columns if 'Time' in c]
+    stat_cols = ['Year', 'Gender', 'Race'] + time_cols + (['ageinyear'] if has_age else [])
+    key_stats = key_nunique(dup_df, tuple(stat_cols))
 
     with st.expander("Hypothesis 1: Cross-Year Duplicates"):
-        cross_year = dup_df.groupby('PcrKey')['Year'].nunique().value_counts()
+        cross_year = key_stats['Year'].value_counts()
         st.write("All duplicated incidents appear within the same year, ruling this out as a primary cause.")
         st.dataframe(cross_year.reset_index().rename(columns={'index': 'Number of Unique Years', 'Year': 'Count of Incidents'}))
 
     with st.expander("Hypothesis 2: Multi-Patient Duplicates"):
-        age_col = 'ageinyear' if 'ageinyear' in dup_df.columns else 'PcrKey' # Check for actual age column
-        multi_patient = dup_df.groupby('PcrKey')[['Gender', age_col]].nunique()
-        is_multi = ((multi_patient['Gender'] > 1) | (multi_patient[age_col] > 1)).sum()
+        multi = key_stats['Gender'] > 1
+        if has_age:
+            multi |= key_stats['ageinyear'] > 1
+        is_multi = multi.sum()
         st.write(f"I checked if duplicated keys had different gender or age values. **Result: {is_multi} cases found.** This is not the cause.")
 
     with st.expander("Hypothesis 3: Revision Duplicates"):
-        time_cols = [c for c in fdf.columns if 'Time' in c]
         if time_cols:
-            revision_like = dup_df.groupby('PcrKey')[time_cols].nunique().max(axis=1) > 1
+            revision_like = key_stats[time_cols].max(axis=1) > 1
             st.write(f"I checked for differences in timestamps across records with the same key. **Result: {revision_like.sum()} cases found.** This is also not the cause.")
         else:
             st.warning("No time-related columns found in the sample data to perform this check.")
@@ -151,13 +320,13 @@ elif page == "🧹 Handling Data Duplicates":
     Specifically, for the same incident (`PcrKey`), all columns were identical *except for `Race`*. This suggests EMS teams occasionally created multiple records for a single patient due to accidental misclassification of race.
     """)
     
-    race_diffs = dup_df.groupby('PcrKey')['Race'].nunique()
+    race_diffs = key_stats['Race']
     keys_with_diff_race = race_diffs[race_diffs > 1].index
     
     if not keys_with_diff_race.empty:
-        example_key = keys_with_diff_race[0]
+        example_key = keys_with_diff_race.min()  # smallest key, as the sorted groupby used to show
         example_df = dup_df[dup_df['PcrKey'] == example_key].sort_values('Race')
-        st.dataframe(example_df)
+        st.dataframe(example_df.head(MAX_PREVIEW_ROWS), use_container_width=True)
         st.caption(f"Example: The two rows above share the same `PcrKey` ({example_key}) but have different `Race` values. All other fields are identical.")
     else:
         st.warning("A clear example of race discrepancy was not found in this specific 100k sample, but the pattern was confirmed in the full dataset.")
@@ -169,17 +338,18 @@ elif page == "🧹 Handling Data Duplicates":
     """)
     st.success(f"**Action Taken:** In my full 6-million-row research dataset, all identified duplicate rows were removed to ensure the integrity of the modeling results.")
 
-elif page == "🕵️ Handling Missing Values":
+@st.fragment
+def render_missing_values(fdf: pd.DataFrame):
+    """Semantic null cleaning, imputation check, and `Age Units` analysis."""
     st.title("🕵️ Handling Missing Values")
     st.markdown("A simple check for `NaN` values often misses text-based entries that represent missing data, known as **semantic missing values**. This page shows the process of identifying and standardizing them.")
 
     st.subheader("Step 1: Initial Missing Value Heatmap (Before Cleaning)")
     st.markdown("First, a look at the missing values detected by a standard `isnull()` check. Notice that many columns appear to be complete.")
     
-    fig_before, ax_before = plt.subplots(figsize=(6, 4))
-    sns.heatmap(fdf.isnull(), cbar=False, cmap="viridis", ax=ax_before)
-    ax_before.set_title("Missing Values Heatmap (Before Cleaning Semantic Nulls)")
-    st.pyplot(fig_before)
+    stripes_before = missing_stripes(fdf, 'before')
+    st.plotly_chart(fig_missing_heatmap(stripes_before, "Missing Values Heatmap (Before Cleaning Semantic Nulls)"),
+                    use_container_width=True)
 
     st.subheader("Step 2: Uncovering Semantic Missing Values")
     st.markdown("Many columns contained text like 'unknown' or 'not recorded'. I identified these common null-like values to standardize them into true `NaN` values.")
@@ -189,13 +359,25 @@ elif page == "🕵️ Handling Missing Values":
     ]
     st.code(f"Common semantic nulls targeted:\n{common_nulls}", language='python')
 
-    @st.cache_data
+    @st.cache_data(max_entries=1)
     def normalize_and_replace_nulls(df_to_clean):
         dfc = df_to_clean.copy()
         for col in dfc.columns:
-            if pd.api.types.is_object_dtype(dfc[col]) or pd.api.types.is_string_dtype(dfc[col]):
-                dfc[col] = dfc[col].where(dfc[col].isna(), dfc[col].astype(str).str.lower().str.strip())
-                dfc[col] = dfc[col].replace(common_nulls, np.nan)
+            if isinstance(dfc[col].dtype, pd.CategoricalDtype):
+                # Normalize the handful of category labels instead of every row, then remap the codes.
+                labels = pd.Series(dfc[col].cat.categories.astype(str).str.lower().str.strip())
+                labels = labels.where(~labels.isin(common_nulls))
+                new_cats = pd.Index(labels.dropna().unique())
+                code_map = new_cats.get_indexer(labels)
+                codes = dfc[col].cat.codes.to_numpy()
+                new_codes = np.where(codes >= 0, code_map[codes], -1)
+                dfc[col] = pd.Categorical.from_codes(new_codes, categories=new_cats)
+            elif pd.api.types.is_object_dtype(dfc[col]) or pd.api.types.is_string_dtype(dfc[col]):
+                # Same trick for plain text columns: clean each distinct value once and take them back by code.
+                codes, uniques = pd.factorize(dfc[col])
+                labels = pd.Series(uniques).astype(str).str.lower().str.strip()
+                labels = labels.where(~labels.isin(common_nulls))
+                dfc[col] = pd.Series(labels.array.take(codes, allow_fill=True), index=dfc.index)
         return dfc
 
     fdf_cleaned = normalize_and_replace_nulls(fdf)
@@ -203,11 +385,10 @@ elif page == "🕵️ Handling Missing Values":
     st.subheader("Step 3: Visualizing True Missingness (After Cleaning)")
     st.markdown("After standardizing the semantic nulls, the heatmap reveals the true extent of missing data much more accurately.")
     
-    fig_after, ax_after = plt.subplots(figsize=(6, 4))
-    sns.heatmap(fdf_cleaned.isnull(), cbar=False, cmap="viridis", ax=ax_after)
-    ax_after.set_title("Missing Values Heatmap (After Cleaning Semantic Nulls)")
-    st.pyplot(fig_after)
-    st.caption("Each yellow line represents a missing value. The 'after' picture is much clearer.")
+    stripes_after = missing_stripes(fdf_cleaned, 'after')
+    st.plotly_chart(fig_missing_heatmap(stripes_after, "Missing Values Heatmap (After Cleaning Semantic Nulls)"),
+                    use_container_width=True)
+    st.caption("Each band covers a block of consecutive rows; the brighter it is, the larger the share of missing values. The 'after' picture is much clearer.")
 
     st.subheader("Step 4: Handling Missing 'ageinyear' Values")
     st.markdown("The `ageinyear` column had some missing values. My initial approach was to use a simple mean imputation.")
@@ -217,13 +398,16 @@ elif page == "🕵️ Handling Missing Values":
 
     col1, col2 = st.columns(2)
     with col1:
-        fig_before_impute = px.histogram(fdf_cleaned.dropna(subset=['ageinyear']), x='ageinyear', nbins=50, title="Original Age Distribution")
+        centers, counts = hist_counts(fdf_cleaned['ageinyear'].dropna().to_numpy(), 50)
+        fig_before_impute = px.bar(x=centers, y=counts, labels={'x': 'ageinyear', 'y': 'count'}, title="Original Age Distribution")
+        fig_before_impute.update_layout(bargap=0)
         st.plotly_chart(fig_before_impute, use_container_width=True)
     
     with col2:
-        df_imputed = fdf_cleaned.copy()
-        df_imputed['ageinyear'] = df_imputed['ageinyear'].fillna(mean_age)
-        fig_after_impute = px.histogram(df_imputed, x='ageinyear', nbins=50, title="After Naive Mean Imputation")
+        imputed_age = fdf_cleaned['ageinyear'].fillna(mean_age)
+        centers, counts = hist_counts(imputed_age.to_numpy(), 50)
+        fig_after_impute = px.bar(x=centers, y=counts, labels={'x': 'ageinyear', 'y': 'count'}, title="After Naive Mean Imputation")
+        fig_after_impute.update_layout(bargap=0)
         fig_after_impute.add_vline(x=mean_age, line_width=2, line_dash="dash", line_color="red", annotation_text=f"Spike at Mean: {mean_age:.1f}")
         st.plotly_chart(fig_after_impute, use_container_width=True)
         
@@ -235,19 +419,25 @@ elif page == "🕵️ Handling Missing Values":
     st.subheader("Step 5: Deep Dive into 'Age Units'")
     st.markdown("Another key area of concern was the `ageinyear` column, which could be misinterpreted without its corresponding `Age Units` (e.g., an age of 11 could mean years or months).")
 
-    if 'Age Units' in fdf_cleaned.columns:
-        age_units_counts = fdf_cleaned['Age Units'].fillna('Missing').value_counts().reset_index()
+    if 'Age Units' in COLS:
+        age_units = fdf_cleaned['Age Units'].cat.add_categories('Missing').fillna('Missing')
+        age_units_counts = age_units.value_counts().loc[lambda s: s > 0].reset_index()
         age_units_counts.columns = ['Age Units', 'Count']
+        # One trace with per-bar colors and server-formatted labels (instead of one trace per unit).
+        palette = px.colors.qualitative.Plotly
         fig_age_units = px.bar(
-            age_units_counts, x='Age Units', y='Count', color='Age Units',
-            text='Count', title='Distribution of Age Units'
+            age_units_counts, x='Age Units', y='Count', title='Distribution of Age Units'
+        )
+        fig_age_units.update_traces(
+            text=age_units_counts['Count'].map('{:,}'.format), textposition='outside',
+            marker_color=[palette[i % len(palette)] for i in range(len(age_units_counts))]
         )
-        fig_age_units.update_traces(texttemplate='%{text:,}', textposition='outside')
         st.plotly_chart(fig_age_units, use_container_width=True)
 
-        non_years_df = fdf_cleaned[fdf_cleaned['Age Units'].fillna('Missing') != 'years']
-        st.write(f"**Finding:** There are **{len(non_years_df):,} rows** in the sample where the age unit is not 'years'. Most of these correspond to infants.")
-        st.dataframe(non_years_df[['ageinyear', 'Age Units']].head())
+        # Count straight off the mask; only the two previewed columns are gathered.
+        non_years = age_units != 'years'
+        st.write(f"**Finding:** There are **{int(non_years.sum()):,} rows** in the sample where the age unit is not 'years'. Most of these correspond to infants.")
+        st.dataframe(fdf_cleaned.loc[non_years, ['ageinyear', 'Age Units']].head())
     else:
         st.warning("'Age Units' column not found in the dataset.")
     
@@ -256,7 +446,9 @@ elif page == "🕵️ Handling Missing Values":
     **Action Taken:** Since my analysis focuses on disparities across broader age **groups** (e.g., '0-24', '25-34'), and not on fine-grained age differences for infants, I removed rows where the `Age Units` were not 'years' in my full dataset. This ensures consistency without sacrificing the core objectives of the study.
     """)
 
-elif page == "🏛️ US Census Data Merging":
+@st.fragment
+def render_census_merging(fdf: pd.DataFrame):
+    """Why population denominators matter and the ACS merge status."""
     st.title("🏛️ US Census Data Merging: Completed Integration")
 
     st.markdown("""
@@ -303,7 +495,9 @@ elif page == "🏛️ US Census Data Merging":
     """)
 
 
-elif page == "📊 Visualization":
+@st.fragment
+def render_visualization(fdf: pd.DataFrame):
+    """Key raw-count charts."""
     st.title("📊 Key Visualizations")
     
 
@@ -312,23 +506,15 @@ elif page == "📊 Visualization":
 
     # Chart 1: Gender Donut
     with col1:
-        if 'Gender' in fdf:
-            gender_counts = fdf.dropna(subset=['Gender']).groupby('Gender').size().reset_index(name='Count')
-            fig_gender = px.pie(gender_counts, names='Gender', values='Count', hole=0.4,
-                                title="Crash Counts by Gender")
-            fig_gender.update_traces(textinfo='percent+label', pull=[0.04]*len(gender_counts))
-            st.plotly_chart(fig_gender, use_container_width=True)
+        if 'Gender' in COLS:
+            gender_counts = agg_counts(fdf, ('Gender',)).sort_values('Gender')
+            st.plotly_chart(fig_gender_donut(gender_counts), use_container_width=True)
 
     # Chart 2: Race Bar
     with col2:
-        if 'Race' in fdf:
-            race_counts = (fdf.dropna(subset=['Race'])
-                              .groupby('Race').size().reset_index(name='Count')
-                              .sort_values('Count', ascending=False))
-            fig_race = px.bar(race_counts, x='Race', y='Count', color='Race',
-                             title="Crash Counts by Race")
-            fig_race.update_layout(xaxis_tickangle=35)
-            st.plotly_chart(fig_race, use_container_width=True)
+        if 'Race' in COLS:
+            race_counts = agg_counts(fdf, ('Race',)).sort_values('Count', ascending=False)
+            st.plotly_chart(fig_race_bar(race_counts), use_container_width=True)
     
     st.divider()
     
@@ -336,26 +522,23 @@ elif page == "📊 Visualization":
 
     # Chart 3: Year trend
     with col3:
-        if 'Year' in fdf:
-            year_counts = fdf.dropna(subset=['Year']).groupby('Year').size().reset_index(name='Count')
-            year_counts['Year'] = year_counts['Year'].astype('Int64')
-            fig_year = px.line(year_counts, x='Year', y='Count', markers=True,
-                          title='Crash Counts by Year')
-            fig_year.update_layout(xaxis=dict(dtick=1))
-            st.plotly_chart(fig_year, use_container_width=True)
+        if 'Year' in COLS:
+            year_counts = agg_counts(fdf, ('Year',)).sort_values('Year')
+            st.plotly_chart(fig_year_line(year_counts), use_container_width=True)
 
     # Chart 4: Division bar
     with col4:
-        if 'USCensusDivision' in fdf:
-            div_counts = (fdf.dropna(subset=['USCensusDivision'])
-                             .groupby('USCensusDivision').size()
-                             .reset_index(name='Count').sort_values('Count', ascending=False))
-            fig_div = px.bar(div_counts, x='USCensusDivision', y='Count', color='USCensusDivision',
-                         title='Crash Counts by U.S. Census Division')
-            fig_div.update_layout(xaxis_tickangle=35, showlegend=False)
-            st.plotly_chart(fig_div, use_container_width=True)
-
-
-
-
-
+        if 'USCensusDivision' in COLS:
+            div_counts = agg_counts(fdf, ('USCensusDivision',)).sort_values('Count', ascending=False)
+            st.plotly_chart(fig_division_bar(div_counts), use_container_width=True)
+
+
+# Only the selected page's renderer runs on each rerun.
+PAGE_RENDERERS = {
+    "overview": render_overview,
+    "data_duplicates": render_data_duplicates,
+    "missing_values": render_missing_values,
+    "census_merging": render_census_merging,
+    "visualization": render_visualization,
+}
+PAGE_RENDERERS[pages[page]](fdf)